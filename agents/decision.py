@@ -1,25 +1,44 @@
+SEPARATOR = "-" * 50
+
+ANALYSIS_TEMPLATE = "\nOption %d: %s\nAnalysis: %s\n" + SEPARATOR + "\n"
+PROMPT_TEMPLATE = (
+    "Based on the following analyses, recommend the best option and explain why:\n"
+    "%s\n"
+    "Please provide a clear recommendation with reasoning."
+)
+
 class DecisionAgent:
     def __init__(self, llm):
         self.llm = llm
 
-    def __call__(self, state):
-        # Format the analyses for better readability
-        analyses_text = ""
-        for i, analysis in enumerate(state['analyses']):
-            analyses_text += f"\nOption {i+1}: {analysis['option']}\n"
-            analyses_text += f"Analysis: {analysis['analysis']}\n"
-            analyses_text += "-" * 50 + "\n"
-        
-        prompt = (
-            f"Based on the following analyses, recommend the best option and explain why:\n"
-            f"{analyses_text}\n"
-            f"Please provide a clear recommendation with reasoning."
-        )
-        
+    def __call__(self, state, config=None):
+        prompt = self._build_prompt(state)
+        on_token = _on_token(config)
         try:
-            recommendation = self.llm.generate(prompt)
-            state['recommendation'] = recommendation
+            if on_token is None:
+                recommendation = self.llm.generate(prompt)
+            else:
+                chunks = []
+                for chunk in self.llm.stream(prompt):
+                    chunks.append(chunk)
+                    on_token(chunk)
+                recommendation = "".join(chunks)
         except Exception as e:
-            state['recommendation'] = f"Error generating recommendation: {str(e)}"
+            recommendation = f"Error generating recommendation: {str(e)}"
         
-        return state
+        return {'recommendation': recommendation}
+
+    def _build_prompt(self, state):
+        # Format the analyses for better readability
+        analyses_text = "".join(
+            ANALYSIS_TEMPLATE % (i + 1, analysis['option'], analysis['analysis'])
+            for i, analysis in enumerate(state['analyses'])
+        )
+        return PROMPT_TEMPLATE % analyses_text
+
+def _on_token(config):
+    # Callers opt into streaming per run with
+    # workflow.invoke(state, config={"configurable": {"on_token": callback}})
+    if not config:
+        return None
+    return config.get("configurable", {}).get("on_token")
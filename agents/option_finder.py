@@ -5,5 +5,4 @@ class OptionFinderAgent:
     def __call__(self, state):
         query = state['query']
         results = self.vector_store.similarity_search(query, k=5)
-        state['candidates'] = results
-        return state
+        return {'candidates': results}
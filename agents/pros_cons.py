@@ -1,25 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from config import LLM_MAX_CONCURRENCY
+
+PROMPT_TEMPLATE = (
+    "Analyze the following option and provide pros and cons:\n"
+    "Option %d: %s\n"
+    "Please provide a structured analysis with clear pros and cons."
+)
+
 class ProsConsAgent:
-    def __init__(self, llm):
+    def __init__(self, llm, max_concurrency=LLM_MAX_CONCURRENCY):
         self.llm = llm
+        self.max_concurrency = max_concurrency
 
     def __call__(self, state):
-        analyses = []
-        for i, option in enumerate(state['candidates']):
-            prompt = (
-                f"Analyze the following option and provide pros and cons:\n"
-                f"Option {i+1}: {option.page_content}\n"
-                f"Please provide a structured analysis with clear pros and cons."
-            )
-            try:
-                result = self.llm.generate(prompt)
-                analyses.append({
-                    'option': option.page_content,
-                    'analysis': result
-                })
-            except Exception as e:
-                analyses.append({
-                    'option': option.page_content,
-                    'analysis': f"Error analyzing option: {str(e)}"
-                })
-        state['analyses'] = analyses
-        return state
+        candidates = state['candidates']
+        first_positions = _first_positions(candidates)
+        if not first_positions:
+            return {'analyses': []}
+
+        # Fan the blocking calls out over threads, capped to respect Gemini
+        # rate limits. The sync client is used on purpose: the Gemini async
+        # client stays bound to the first event loop it ran on.
+        max_workers = min(self.max_concurrency, len(first_positions))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.llm.generate, PROMPT_TEMPLATE % (i + 1, content))
+                for content, i in first_positions.items()
+            ]
+            results = [_outcome(future) for future in futures]
+        return {'analyses': _analyses(candidates, dict(zip(first_positions, results)))}
+
+def _first_positions(candidates):
+    # Retrieval can return the same text more than once; analyze each
+    # distinct option a single time, numbered by its first position
+    first_positions = {}
+    for i, option in enumerate(candidates):
+        first_positions.setdefault(option.page_content, i)
+    return first_positions
+
+def _outcome(future):
+    # Errors come back as values so one failed option does not hide the others
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+def _analyses(candidates, results_by_content):
+    analyses = []
+    for option in candidates:
+        result = results_by_content[option.page_content]
+        if isinstance(result, Exception):
+            result = f"Error analyzing option: {str(result)}"
+        analyses.append({
+            'option': option.page_content,
+            'analysis': result
+        })
+    return analyses
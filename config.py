@@ -5,3 +5,30 @@ from dotenv import load_dotenv
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# LLM response cache (in-process LRU backed by an on-disk store)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/llm_cache")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+# Responses kept on disk; the least recently used are deleted beyond this
+LLM_CACHE_DISK_SIZE = int(os.getenv("LLM_CACHE_DISK_SIZE", "10000"))
+# Upper bound on concurrent LLM requests issued by one agent step
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# FAISS search tuning: IVF lists probed per query (recall/latency tradeoff)
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+# Vector compression: "none" (float32), "fp16", "sq8" (8-bit scalar) or "pq" (product quantization)
+FAISS_QUANTIZATION = os.getenv("FAISS_QUANTIZATION", "none").lower()
+# Candidates fetched per result from a sq8/pq index before exact re-scoring. Values above 1
+# keep a full float32 copy of the vectors, so compression then costs memory instead of saving it
+FAISS_RERANK_FACTOR = int(os.getenv("FAISS_RERANK_FACTOR", "1"))
+# Directory for persisted FAISS indexes, reused when the same data is loaded again (empty disables)
+FAISS_INDEX_PATH = os.getenv("FAISS_INDEX_PATH", "data/faiss_index")
+# Persisted FAISS indexes kept on disk; the least recently used are deleted beyond this
+FAISS_INDEX_CACHE_SIZE = int(os.getenv("FAISS_INDEX_CACHE_SIZE", "16"))
+# Encode embeddings in float16 when a CUDA device is available
+EMBEDDING_HALF_PRECISION = os.getenv("EMBEDDING_HALF_PRECISION", "true").lower() in ("1", "true", "yes")
+# Embedding backend: "huggingface" (sentence-transformers on PyTorch) or "onnx" (ONNX Runtime)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface").lower()
+# ONNX export directory per model; {model_name} is replaced by the VectorStore model name
+EMBEDDING_ONNX_PATH = os.getenv("EMBEDDING_ONNX_PATH", "models/{model_name}-onnx")
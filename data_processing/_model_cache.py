@@ -0,0 +1,54 @@
+import functools
+import threading
+
+from config import EMBEDDING_BACKEND, EMBEDDING_HALF_PRECISION, EMBEDDING_ONNX_PATH
+
+EMBEDDING_BATCH_SIZE = 64
+
+# lru_cache lets concurrent first calls all miss and load the model; the lock
+# makes threads building stores side by side (e.g. the parallel demos) wait
+# for the one load instead
+_load_lock = threading.Lock()
+
+def get_embeddings(model_name):
+    with _load_lock:
+        return _load_embeddings(model_name)
+
+@functools.lru_cache(maxsize=4)
+def _load_embeddings(model_name):
+    # Loading the sentence-transformers weights takes seconds, so every
+    # VectorStore in the process shares one instance per model name
+    if EMBEDDING_BACKEND == "onnx":
+        from .onnx_embeddings import OnnxMiniLMEmbeddings
+        return OnnxMiniLMEmbeddings(onnx_model_dir(model_name), batch_size=EMBEDDING_BATCH_SIZE)
+
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    model_kwargs = {}
+    if embedding_runtime() == "cuda-fp16":
+        import torch
+        model_kwargs = {'device': 'cuda', 'model_kwargs': {'torch_dtype': torch.float16}}
+
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={
+            'batch_size': EMBEDDING_BATCH_SIZE,
+            'normalize_embeddings': True
+        }
+    )
+
+@functools.lru_cache(maxsize=1)
+def embedding_runtime():
+    # Device and precision the huggingface backend encodes with. Half precision
+    # doubles encoder throughput on GPUs; CPUs stay on float32, where fp16
+    # matmuls are emulated and usually slower
+    import torch
+    if not torch.cuda.is_available():
+        return "cpu-fp32"
+    return "cuda-fp16" if EMBEDDING_HALF_PRECISION else "cuda-fp32"
+
+def onnx_model_dir(model_name):
+    # Each model needs its own export; a path without the placeholder is used
+    # as is, so it must hold an export of the requested model
+    return EMBEDDING_ONNX_PATH.format(model_name=model_name)
@@ -1,10 +1,14 @@
 import pandas as pd
 from .document import Document
 
-def load_csv(file_path):
-    df = pd.read_csv(file_path)
-    docs = []
-    for _, row in df.iterrows():
-        doc = Document(content=row['description'], metadata=row.to_dict())
-        docs.append(doc)
-    return docs
+def load_csv(file_path, **read_csv_kwargs):
+    return docs_from_dataframe(pd.read_csv(file_path, **read_csv_kwargs))
+
+def docs_from_dataframe(df):
+    # Identical rows would become identical documents that crowd the top-k
+    # results and cost an extra LLM analysis each, so keep a single copy
+    df = df.drop_duplicates(ignore_index=True)
+    # Column-wise conversion avoids boxing every cell into a Series per row
+    records = df.to_dict(orient='records')
+    contents = df['description'].tolist()
+    return [Document(content=content, metadata=record) for content, record in zip(contents, records)]
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+MODEL_FILE = "model.onnx"
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """Sentence embeddings from an ONNX export of a MiniLM sentence-transformer.
+
+    Expects a directory produced by ``optimum-cli export onnx`` (and optionally
+    ``optimum-cli onnxruntime quantize``) holding the tokenizer files and either
+    ``model_quantized.onnx`` or ``model.onnx``. Output matches the
+    sentence-transformers pipeline: mean pooling followed by L2 normalization.
+    """
+
+    def __init__(self, model_dir, batch_size=64, max_length=256):
+        try:
+            import onnxruntime
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX embedding backend needs onnxruntime and transformers: "
+                "pip install onnxruntime transformers"
+            ) from e
+
+        model_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE)
+        if not os.path.exists(model_path):
+            model_path = os.path.join(model_dir, MODEL_FILE)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    def embed_documents(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._encode(texts[start:start + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text):
+        return self._encode([text])[0].tolist()
+
+    def _encode(self, texts):
+        encoded = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names if name in encoded}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean-pool over real tokens only, then normalize like sentence-transformers does
+        mask = encoded["attention_mask"][..., np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
@@ -1,25 +1,278 @@
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.schema import Document as LangchainDocument
+import hashlib
+import json
+import math
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+
+from config import (
+    EMBEDDING_BACKEND,
+    FAISS_INDEX_CACHE_SIZE,
+    FAISS_INDEX_PATH,
+    FAISS_NPROBE,
+    FAISS_QUANTIZATION,
+    FAISS_RERANK_FACTOR,
+)
+from ._model_cache import embedding_runtime, get_embeddings, onnx_model_dir
+
+QUERY_CACHE_SIZE = 512
+
+# Index selection thresholds: exact search below IVF_MIN_DOCUMENTS, inverted
+# lists up to HNSW_MIN_DOCUMENTS, graph search beyond that
+IVF_MIN_DOCUMENTS = 10_000
+HNSW_MIN_DOCUMENTS = 100_000
+HNSW_NEIGHBORS = 32
+# FAISS k-means warns below this many training points per centroid, both for
+# IVF inverted lists and for PQ codebooks
+MIN_POINTS_PER_CENTROID = 39
+
+QUANTIZATION_MODES = ("none", "fp16", "sq8", "pq")
+PQ_MAX_SUBQUANTIZERS = 48
+PQ_BITS = 8
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.pkl"
+MANIFEST_FILE = "manifest.json"
 
 class VectorStore:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    def __init__(self, model_name="all-MiniLM-L6-v2", index_path=FAISS_INDEX_PATH):
+        self.model_name = model_name
+        self.index_path = index_path
+        self.embeddings = get_embeddings(model_name)
         self.db = None
+        self._query_cache = OrderedDict()
     
     def add_documents(self, documents):
-        # Convert our Document objects to Langchain Documents
-        langchain_docs = []
-        for doc in documents:
-            langchain_doc = LangchainDocument(
-                page_content=doc.content,
-                metadata=doc.metadata
-            )
-            langchain_docs.append(langchain_doc)
+        # faiss and langchain are imported on first use so that importing this
+        # module (and everything that only needs config or ingest) stays cheap
+        import faiss
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain.schema import Document as LangchainDocument
+
+        if not documents:
+            self.db = None
+            return
+
+        # Reuse a previously built index for the same documents and settings
+        index_dir = None
+        if self.index_path:
+            index_dir = os.path.join(self.index_path, _fingerprint(self.model_name, documents))
+            manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                try:
+                    self.db = self._read(index_dir)
+                    # Mark the entry as recently used so pruning keeps it
+                    os.utime(manifest_path)
+                    return
+                except (OSError, EOFError, RuntimeError, ValueError, pickle.UnpicklingError):
+                    pass
+
+        # Encode every document in one batched call rather than letting the
+        # store wrap and embed them one Langchain Document at a time; faiss needs
+        # one C-contiguous float32 block whatever type the backend hands back
+        texts = [doc.content for doc in documents]
+        vectors = np.ascontiguousarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        index = _build_index(vectors)
         
-        self.db = FAISS.from_documents(langchain_docs, self.embeddings)
+        docstore_ids = [str(i) for i in range(len(documents))]
+        docstore = InMemoryDocstore({
+            doc_id: LangchainDocument(page_content=doc.content, metadata=doc.metadata)
+            for doc_id, doc in zip(docstore_ids, documents)
+        })
+        self.db = self._wrap(index, docstore, dict(enumerate(docstore_ids)))
+
+        if index_dir:
+            try:
+                self.save(index_dir)
+                _prune_indexes(self.index_path, FAISS_INDEX_CACHE_SIZE)
+            except OSError:
+                # Persistence only saves work on the next start; the store is usable as is
+                pass
+
+    def save(self, path):
+        import faiss
+
+        if self.db is None:
+            raise ValueError("Cannot save an empty vector store")
+
+        os.makedirs(path, exist_ok=True)
+        faiss.write_index(self.db.index, os.path.join(path, INDEX_FILE))
+        with open(os.path.join(path, DOCSTORE_FILE), "wb") as f:
+            pickle.dump((self.db.docstore, self.db.index_to_docstore_id), f)
+        # The manifest is written last so a half-written directory is never loaded
+        with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "model_name": self.model_name,
+                "dimension": self.db.index.d,
+                "count": self.db.index.ntotal
+            }, f)
+
+    @classmethod
+    def load(cls, path, model_name="all-MiniLM-L6-v2"):
+        # The docstore is unpickled, so only pass directories written by save()
+        # from a trusted source; a crafted directory can run arbitrary code
+        store = cls(model_name=model_name, index_path=None)
+        store.db = store._read(path)
+        return store
+
+    def _read(self, path):
+        import faiss
+
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("model_name") != self.model_name:
+            raise ValueError(
+                f"Index at {path} was built with {manifest.get('model_name')}, not {self.model_name}"
+            )
+
+        # Memory-map the index so only the pages searches touch become resident
+        index = faiss.read_index(
+            os.path.join(path, INDEX_FILE),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        )
+        # nprobe is serialized with the index; apply the current setting instead
+        # of the one the index was built with
+        base = faiss.downcast_index(index.base_index) if isinstance(index, faiss.IndexRefine) else index
+        if isinstance(base, faiss.IndexIVF):
+            base.nprobe = FAISS_NPROBE
+        # Unpickling is only safe for directories written by save(): the index
+        # cache under index_path, or trusted paths given to load()
+        with open(os.path.join(path, DOCSTORE_FILE), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return self._wrap(index, docstore, index_to_docstore_id)
+
+    def _wrap(self, index, docstore, index_to_docstore_id):
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        return FAISS(
+            self.embeddings,
+            index,
+            docstore,
+            index_to_docstore_id,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
     
     def similarity_search(self, query, k=5):
         if self.db is None:
             return []
-        return self.db.similarity_search(query, k=k)
+        vector = self._embed_query(query)
+        return self.db.similarity_search_by_vector(vector, k=k)
+
+    def _embed_query(self, query):
+        import faiss
+
+        # Reruns with the same query skip the encoder pass entirely
+        if query in self._query_cache:
+            self._query_cache.move_to_end(query)
+            return self._query_cache[query]
+
+        vector = np.ascontiguousarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        vector = vector[0]
+        self._query_cache[query] = vector
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return vector
+
+def _fingerprint(model_name, documents):
+    # Anything that changes the stored vectors or index layout must be part of the key
+    digest = hashlib.sha256()
+    digest.update(
+        f"{EMBEDDING_BACKEND}|{model_name}|{FAISS_QUANTIZATION}|{FAISS_RERANK_FACTOR}".encode("utf-8")
+    )
+    if EMBEDDING_BACKEND == "onnx":
+        # A different export of the same model name can produce different vectors
+        digest.update(f"|{os.path.abspath(onnx_model_dir(model_name))}".encode("utf-8"))
+    else:
+        # fp16 CUDA and float32 CPU encodings of the same text differ slightly
+        digest.update(f"|{embedding_runtime()}".encode("utf-8"))
+    for doc in documents:
+        digest.update(doc.content.encode("utf-8"))
+        digest.update(json.dumps(doc.metadata, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+def _prune_indexes(root, keep):
+    # Least recently used entries go first; every reuse refreshes the manifest mtime
+    entries = []
+    for entry in os.scandir(root):
+        manifest_path = os.path.join(entry.path, MANIFEST_FILE)
+        if entry.is_dir() and os.path.exists(manifest_path):
+            entries.append((os.path.getmtime(manifest_path), entry.path))
+    entries.sort(reverse=True)
+    for _, path in entries[max(keep, 1):]:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _build_index(vectors):
+    import faiss
+
+    # Vectors are unit length, so inner product ranks exactly like cosine similarity
+    metric = faiss.METRIC_INNER_PRODUCT
+    count, dim = vectors.shape
+    quantization = FAISS_QUANTIZATION
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unsupported FAISS_QUANTIZATION '{quantization}', "
+            f"expected one of {', '.join(QUANTIZATION_MODES)}"
+        )
+    if quantization == "pq" and count < MIN_POINTS_PER_CENTROID * 2 ** PQ_BITS:
+        # Each PQ codebook has 2 ** PQ_BITS centroids; with fewer training vectors
+        # than k-means wants for them, scalar quantization is the better choice
+        quantization = "sq8"
+    pq_subquantizers = _pq_subquantizers(dim)
+    scalar_types = {
+        "fp16": faiss.ScalarQuantizer.QT_fp16,
+        "sq8": faiss.ScalarQuantizer.QT_8bit
+    }
+
+    if count >= HNSW_MIN_DOCUMENTS:
+        # No training pass and logarithmic query time for very large corpora
+        if quantization in scalar_types:
+            index = faiss.IndexHNSWSQ(dim, scalar_types[quantization], HNSW_NEIGHBORS, metric)
+        elif quantization == "pq":
+            index = faiss.IndexHNSWPQ(dim, pq_subquantizers, HNSW_NEIGHBORS, PQ_BITS, metric)
+        else:
+            index = faiss.IndexHNSWFlat(dim, HNSW_NEIGHBORS, metric)
+    elif count >= IVF_MIN_DOCUMENTS:
+        quantizer = faiss.IndexFlatIP(dim)
+        nlist = min(int(4 * math.sqrt(count)), count // MIN_POINTS_PER_CENTROID)
+        if quantization in scalar_types:
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dim, nlist, scalar_types[quantization], metric
+            )
+        elif quantization == "pq":
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_subquantizers, PQ_BITS, metric)
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+        index.nprobe = FAISS_NPROBE
+    else:
+        # Brute force is exact and still fast at this size
+        if quantization in scalar_types:
+            index = faiss.IndexScalarQuantizer(dim, scalar_types[quantization], metric)
+        elif quantization == "pq":
+            index = faiss.IndexPQ(dim, pq_subquantizers, PQ_BITS, metric)
+        else:
+            index = faiss.IndexFlatIP(dim)
+
+    # fp16 keeps distances accurate enough that re-scoring would not change the ranking
+    if quantization in ("sq8", "pq") and FAISS_RERANK_FACTOR > 1:
+        # Compressed codes only approximate distances: pull k * factor candidates
+        # and re-score them against the full precision vectors
+        index = faiss.IndexRefineFlat(index)
+        index.k_factor = FAISS_RERANK_FACTOR
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+def _pq_subquantizers(dim):
+    # PQ splits each vector into equal sub-vectors, so M has to divide dim
+    for m in range(min(PQ_MAX_SUBQUANTIZERS, dim), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
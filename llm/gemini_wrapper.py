@@ -1,11 +1,125 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import HumanMessage
 
+from config import LLM_CACHE_ENABLED, LLM_CACHE_DIR, LLM_CACHE_DISK_SIZE, LLM_CACHE_SIZE
+
 class GeminiLLMWrapper:
-    def __init__(self, api_key, model="gemini-2.5-flash"):
+    def __init__(self, api_key, model="gemini-2.5-flash", enable_cache=LLM_CACHE_ENABLED,
+                 cache_dir=LLM_CACHE_DIR, cache_size=LLM_CACHE_SIZE,
+                 disk_cache_size=LLM_CACHE_DISK_SIZE):
         self.llm = ChatGoogleGenerativeAI(google_api_key=api_key, model=model)
+        self.model = model
+        self.enable_cache = enable_cache
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.disk_cache_size = disk_cache_size
+        self._cache = OrderedDict()
+        # One wrapper may be shared by threads (e.g. parallel demos)
+        self._cache_lock = threading.Lock()
     
     def generate(self, prompt):
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         message = HumanMessage(content=prompt)
         response = self.llm.invoke([message])
+        self._cache_put(key, response.content)
         return response.content
+
+    def stream(self, prompt):
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        message = HumanMessage(content=prompt)
+        for chunk in self.llm.stream([message]):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+        self._cache_put(key, "".join(chunks))
+
+    def _cache_key(self, prompt):
+        # The model is part of the key so switching models never serves stale answers
+        return hashlib.sha256(f"{self.model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def _cache_get(self, key):
+        if not self.enable_cache:
+            return None
+
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            # Mark the entry as recently used so pruning keeps it
+            os.utime(path)
+        except OSError:
+            return None
+        self._remember(key, content)
+        return content
+
+    def _cache_put(self, key, content):
+        # Empty replies (blocked prompts, streams that yielded nothing) are
+        # worth retrying, so they are never stored
+        if not self.enable_cache or not isinstance(content, str) or not content:
+            return
+
+        self._remember(key, content)
+        path = self._cache_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so a concurrent reader never sees a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            # The disk tier is best-effort; the in-process tier still holds the entry
+            pass
+
+    def _prune_disk(self):
+        # Least recently used entries go first; every disk hit refreshes the file mtime
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".txt"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= self.disk_cache_size:
+            return
+        entries.sort(reverse=True)
+        for _, path in entries[max(self.disk_cache_size, 1):]:
+            try:
+                os.remove(path)
+            except OSError:
+                # Another thread or process may have pruned it first
+                pass
+
+    def _remember(self, key, content):
+        with self._cache_lock:
+            self._cache[key] = content
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
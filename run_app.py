@@ -3,7 +3,7 @@
 Simple script to run the Streamlit app
 """
 
-import subprocess
+import os
 import sys
 
 if __name__ == "__main__":
@@ -14,7 +14,11 @@ if __name__ == "__main__":
     print()
     
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "ui/app.py"])
+        # Run Streamlit's CLI in this interpreter instead of spawning a second one
+        from streamlit.web import cli as stcli
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui", "app.py")
+        sys.argv = ["streamlit", "run", app_path]
+        stcli.main()
     except KeyboardInterrupt:
         print("\n👋 App stopped by user")
     except Exception as e:
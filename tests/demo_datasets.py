@@ -3,11 +3,15 @@
 Demo script showing how to use the sample datasets with the multi-agent system
 """
 
+import io
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
 
 from data_processing.ingest import load_csv
 from data_processing.vector_store import VectorStore
@@ -18,25 +22,27 @@ from workflow.orchestrator import build_workflow
 from llm.gemini_wrapper import GeminiLLMWrapper
 from config import GOOGLE_API_KEY
 
-def demo_dataset(csv_file, query, dataset_name):
-    """Demo a specific dataset with a query"""
-    print(f"\n🎯 DEMO: {dataset_name}")
-    print("=" * 50)
-    print(f"📊 Dataset: {csv_file}")
-    print(f"❓ Query: {query}")
-    print()
+# Bounded so a full demo run stays within Gemini's per-minute request limits
+MAX_PARALLEL_DEMOS = 3
+
+def demo_dataset(csv_file, query, dataset_name, llm, out=None):
+    """Demo a specific dataset with a query, writing to out (stdout by default)"""
+    print(f"\n🎯 DEMO: {dataset_name}", file=out)
+    print("=" * 50, file=out)
+    print(f"📊 Dataset: {csv_file}", file=out)
+    print(f"❓ Query: {query}", file=out)
+    print(file=out)
     
     try:
         # Load and process data
-        print("📖 Loading data...")
+        print("📖 Loading data...", file=out)
         docs = load_csv(csv_file)
-        print(f"   Loaded {len(docs)} options")
+        print(f"   Loaded {len(docs)} options", file=out)
         
-        # Initialize system
-        print("🔧 Initializing system...")
+        # Initialize system (the embedding model is loaded once per process)
+        print("🔧 Initializing system...", file=out)
         vs = VectorStore()
         vs.add_documents(docs)
-        llm = GeminiLLMWrapper(api_key=GOOGLE_API_KEY)
         
         # Create agents and workflow
         option_finder = OptionFinderAgent(vs)
@@ -45,24 +51,24 @@ def demo_dataset(csv_file, query, dataset_name):
         workflow = build_workflow(option_finder, pros_cons, decision)
         
         # Run analysis
-        print("🤖 Running multi-agent analysis...")
+        print("🤖 Running multi-agent analysis...", file=out)
         state = {"query": query}
         result = workflow.invoke(state)
         
         # Display results
-        print(f"\n🎯 Found {len(result.get('candidates', []))} relevant options:")
+        print(f"\n🎯 Found {len(result.get('candidates', []))} relevant options:", file=out)
         for i, candidate in enumerate(result.get('candidates', [])[:3]):  # Show top 3
-            print(f"   {i+1}. {candidate.page_content[:80]}...")
+            print(f"   {i+1}. {candidate.page_content[:80]}...", file=out)
         
-        print(f"\n💡 AI Recommendation:")
+        print(f"\n💡 AI Recommendation:", file=out)
         recommendation = result.get('recommendation', 'No recommendation generated')
         # Show first 300 characters of recommendation
-        print(recommendation[:300] + "..." if len(recommendation) > 300 else recommendation)
+        print(recommendation[:300] + "..." if len(recommendation) > 300 else recommendation, file=out)
         
         return True
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
 def main():
@@ -104,15 +110,32 @@ def main():
     ]
     
     successful_demos = 0
+    llm = GeminiLLMWrapper(api_key=GOOGLE_API_KEY)
     
+    available = []
     for demo in demos:
-        if os.path.exists(demo["file"]):
-            if demo_dataset(demo["file"], demo["query"], demo["name"]):
-                successful_demos += 1
-            print("\n" + "-" * 60)
+        csv_file = os.path.join(PROJECT_ROOT, demo["file"])
+        if os.path.exists(csv_file):
+            available.append((demo, csv_file))
         else:
             print(f"❌ Dataset not found: {demo['file']}")
     
+    # The demos are independent and dominated by LLM latency, so run them side
+    # by side and print each one's buffered output in the original order
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DEMOS) as executor:
+        runs = []
+        for demo, csv_file in available:
+            out = io.StringIO()
+            future = executor.submit(demo_dataset, csv_file, demo["query"], demo["name"], llm, out)
+            runs.append((out, future))
+        
+        for out, future in runs:
+            success = future.result()
+            print(out.getvalue(), end="")
+            if success:
+                successful_demos += 1
+            print("\n" + "-" * 60)
+    
     print(f"\n🎉 Completed {successful_demos}/{len(demos)} demos successfully!")
     print("\n📝 To use your own data:")
     print("   1. Create a CSV file with a 'description' column")
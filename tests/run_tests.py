@@ -4,40 +4,46 @@ Test runner for Multi-Agent Decision System
 """
 
 import os
+import runpy
 import sys
-import subprocess
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TESTS_DIR)
+
+BANNER = "=" * 50
+SEPARATOR = "-" * 40
 
 # Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
 
 def run_test(test_name, test_file):
-    """Run a specific test"""
+    """Run a specific test in this interpreter, reusing already imported modules"""
     print(f"\n🧪 Running {test_name}...")
-    print("-" * 40)
+    print(SEPARATOR)
     
+    cwd = os.getcwd()
+    # Tests resolve sample data and scratch files relative to the project root
+    os.chdir(PROJECT_ROOT)
     try:
-        result = subprocess.run([sys.executable, test_file], 
-                              capture_output=False, 
-                              text=True, 
-                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        return result.returncode == 0
+        runpy.run_path(test_file, run_name="__main__")
+        return True
+    except SystemExit as e:
+        return e.code in (None, 0)
     except Exception as e:
         print(f"❌ Error running {test_name}: {e}")
         return False
+    finally:
+        os.chdir(cwd)
 
 def main():
     """Run all tests"""
     print("🚀 Multi-Agent Decision System - Test Suite")
-    print("=" * 50)
-    
-    # Change to tests directory
-    tests_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(tests_dir)
+    print(BANNER)
     
     tests = [
-        ("Component Tests", "test_components.py"),
-        ("System Integration Test", "test_system.py"),
-        ("Dataset Demos", "demo_datasets.py")
+        ("Component Tests", os.path.join(TESTS_DIR, "test_components.py")),
+        ("System Integration Test", os.path.join(TESTS_DIR, "test_system.py")),
+        ("Dataset Demos", os.path.join(TESTS_DIR, "demo_datasets.py"))
     ]
     
     results = []
@@ -47,9 +53,9 @@ def main():
         results.append((test_name, success))
     
     # Summary
-    print("\n" + "=" * 50)
+    print("\n" + BANNER)
     print("📊 TEST RESULTS SUMMARY")
-    print("=" * 50)
+    print(BANNER)
     
     passed = 0
     for test_name, success in results:
@@ -5,14 +5,25 @@ Test individual components without LLM
 
 import os
 import sys
+import tempfile
+import threading
+import faiss
+import numpy as np
 import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_processing.ingest import load_csv
-from data_processing.vector_store import VectorStore
+from data_processing.ingest import load_csv, docs_from_dataframe
+from data_processing.vector_store import (
+    INDEX_FILE, IVF_MIN_DOCUMENTS, MANIFEST_FILE, MIN_POINTS_PER_CENTROID, VectorStore,
+    _build_index, _fingerprint, _prune_indexes
+)
+from config import FAISS_NPROBE
 from agents.option_finder import OptionFinderAgent
+from agents.pros_cons import ProsConsAgent
+from agents.decision import DecisionAgent
+from llm.gemini_wrapper import GeminiLLMWrapper
 
 def test_data_processing():
     """Test data loading and vector store"""
@@ -30,15 +41,14 @@ def test_data_processing():
     }
     
     df = pd.DataFrame(data)
-    df.to_csv('test_data.csv', index=False)
     
     try:
-        # Test document loading
-        docs = load_csv('test_data.csv')
+        # Test document creation straight from the in-memory frame
+        docs = docs_from_dataframe(df)
         print(f"   ✅ Loaded {len(docs)} documents")
         
-        # Test vector store
-        vs = VectorStore()
+        # Test vector store (in memory; persistence is covered separately)
+        vs = VectorStore(index_path=None)
         vs.add_documents(docs)
         print("   ✅ Vector store created")
         
@@ -57,16 +67,281 @@ def test_data_processing():
     except Exception as e:
         print(f"   ❌ Error: {e}")
         return False
+
+def test_vector_store_persistence():
+    """Test index reuse, corrupt-entry fallback, fingerprints and pruning"""
+    print("💾 Testing vector store persistence...")
+    
+    data = {
+        'description': [
+            'Electric car with 300 mile range, fast charging, eco-friendly',
+            'Gas car with powerful engine, affordable, widely available service'
+        ],
+        'price': [45000, 22000]
+    }
+    docs = docs_from_dataframe(pd.DataFrame(data))
+    
+    def top_results(store):
+        return [d.page_content for d in store.similarity_search("affordable car", k=2)]
+    
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            vs = VectorStore(index_path=root)
+            vs.add_documents(docs)
+            index_dir = os.path.join(root, _fingerprint(vs.model_name, docs))
+            assert os.path.exists(os.path.join(index_dir, MANIFEST_FILE)), "index was not saved"
+            expected = top_results(vs)
+            
+            loaded = VectorStore.load(index_dir)
+            assert top_results(loaded) == expected
+            # Release the memory-mapped file before overwriting it below
+            del loaded
+            print("   ✅ Saved index reloads with identical results")
+            
+            # A corrupt entry is rebuilt (and rewritten) instead of failing the load
+            with open(os.path.join(index_dir, INDEX_FILE), "wb") as f:
+                f.write(b"not a faiss index")
+            rebuilt = VectorStore(index_path=root)
+            rebuilt.add_documents(docs)
+            assert top_results(rebuilt) == expected
+            assert VectorStore.load(index_dir).db.index.ntotal == len(docs)
+            print("   ✅ Corrupt index entry rebuilt")
+            
+            # Any metadata change must produce a different entry
+            data['price'] = [46000, 22000]
+            changed = docs_from_dataframe(pd.DataFrame(data))
+            changed_dir = os.path.join(root, _fingerprint(vs.model_name, changed))
+            assert changed_dir != index_dir, "fingerprint ignored a metadata change"
+            VectorStore(index_path=root).add_documents(changed)
+            assert os.path.exists(os.path.join(changed_dir, MANIFEST_FILE))
+            
+            # Pruning keeps the most recently used entries
+            os.utime(os.path.join(index_dir, MANIFEST_FILE), (0, 0))
+            _prune_indexes(root, 1)
+            assert not os.path.exists(index_dir) and os.path.exists(changed_dir)
+            print("   ✅ Fingerprints and pruning behave")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+def test_index_selection():
+    """Test the flat/IVF index choice around the IVF threshold"""
+    print("🗂️ Testing FAISS index selection...")
+    
+    rng = np.random.default_rng(0)
+    
+    def build(count):
+        vectors = rng.standard_normal((count, 16)).astype(np.float32)
+        faiss.normalize_L2(vectors)
+        index = _build_index(vectors)
+        assert index.ntotal == count
+        # Quantized indexes may sit behind an exact re-scoring wrapper
+        if isinstance(index, faiss.IndexRefine):
+            return faiss.downcast_index(index.base_index)
+        return index
+    
+    try:
+        small = build(IVF_MIN_DOCUMENTS - 1)
+        assert not isinstance(small, faiss.IndexIVF), "below the threshold search must stay exact"
+        
+        large = build(IVF_MIN_DOCUMENTS)
+        assert isinstance(large, faiss.IndexIVF), "expected an IVF index at the threshold"
+        # 4 * sqrt(10k) = 400 lists would leave too few training points per list
+        assert large.nlist == IVF_MIN_DOCUMENTS // MIN_POINTS_PER_CENTROID
+        assert large.nprobe == FAISS_NPROBE
+        print(f"   ✅ Flat below {IVF_MIN_DOCUMENTS}, IVF with {large.nlist} lists from there")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+def test_csv_loading():
+    """Test the CSV path of the loader"""
+    print("📄 Testing CSV loading...")
+    
+    # The repeated row should collapse into a single document
+    pd.DataFrame({
+        'description': ['Electric car with 300 mile range', 'Electric car with 300 mile range'],
+        'price': [45000, 45000]
+    }).to_csv('test_data.csv', index=False)
+    
+    try:
+        docs = load_csv('test_data.csv')
+        assert len(docs) == 1
+        assert docs[0].content == 'Electric car with 300 mile range'
+        assert docs[0].metadata['price'] == 45000
+        print(f"   ✅ Loaded {len(docs)} document with metadata")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
     
     finally:
         if os.path.exists('test_data.csv'):
             os.remove('test_data.csv')
 
+class StubLLM:
+    """Records prompts instead of calling Gemini"""
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            count = len(self.prompts)
+        if "broken" in prompt:
+            raise RuntimeError("stub failure")
+        return f"analysis {count}"
+
+class StubOption:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+class StubChatModel:
+    """Stands in for ChatGoogleGenerativeAI behind GeminiLLMWrapper"""
+    def __init__(self, replies):
+        self.replies = replies
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return StubMessage(self.replies.get(messages[0].content, ""))
+
+    def stream(self, messages):
+        self.calls += 1
+        for word in self.replies.get(messages[0].content, "").split(" "):
+            yield StubMessage(word + " ")
+
+class StubMessage:
+    def __init__(self, content):
+        self.content = content
+
+def test_llm_cache():
+    """Test the in-process and on-disk tiers of the LLM response cache"""
+    print("🗄️ Testing LLM response cache...")
+    
+    replies = {"first": "answer one", "second": "answer two"}
+    
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            llm = GeminiLLMWrapper(api_key="test", enable_cache=True, cache_dir=cache_dir, cache_size=1)
+            llm.llm = StubChatModel(replies)
+            
+            assert llm.generate("first") == "answer one"
+            assert llm.generate("first") == "answer one"
+            assert llm.llm.calls == 1, "repeated prompt should be served from memory"
+            
+            # cache_size=1 evicts "first" from memory; the disk tier still has it
+            llm.generate("second")
+            assert len(llm._cache) == 1
+            assert llm.generate("first") == "answer one"
+            assert llm.llm.calls == 2, "evicted prompt should be served from disk"
+            
+            # Empty replies are retried instead of cached
+            llm.generate("blocked")
+            llm.generate("blocked")
+            assert llm.llm.calls == 4, "empty reply should not be cached"
+            
+            # A fresh wrapper (e.g. after a restart) starts from the disk tier
+            restarted = GeminiLLMWrapper(api_key="test", enable_cache=True, cache_dir=cache_dir)
+            restarted.llm = StubChatModel({})
+            assert restarted.generate("second") == "answer two"
+            assert restarted.llm.calls == 0
+            print("   ✅ Memory, disk and empty-reply handling behave")
+        
+        # The disk tier keeps only the most recently used entries
+        with tempfile.TemporaryDirectory() as cache_dir:
+            llm = GeminiLLMWrapper(api_key="test", enable_cache=True, cache_dir=cache_dir,
+                                   disk_cache_size=1)
+            llm.llm = StubChatModel(replies)
+            llm.generate("first")
+            first_path = llm._cache_path(llm._cache_key("first"))
+            os.utime(first_path, (0, 0))
+            llm.generate("second")
+            assert not os.path.exists(first_path), "disk tier was not pruned"
+            assert os.path.exists(llm._cache_path(llm._cache_key("second")))
+            print("   ✅ Disk tier pruned to its size limit")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+def test_decision_streaming():
+    """Test token streaming from DecisionAgent through the cached wrapper"""
+    print("🎯 Testing recommendation streaming...")
+    
+    state = {"analyses": [{'option': "Electric car", 'analysis': "Cheap to run"}]}
+    prompt = DecisionAgent(None)._build_prompt(state)
+    reply = "Choose the electric car"
+    
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            llm = GeminiLLMWrapper(api_key="test", enable_cache=True, cache_dir=cache_dir)
+            llm.llm = StubChatModel({prompt: reply})
+            agent = DecisionAgent(llm)
+            
+            tokens = []
+            config = {"configurable": {"on_token": tokens.append}}
+            recommendation = agent(state, config=config)['recommendation']
+            assert len(tokens) == 4, "each streamed chunk should reach on_token"
+            assert recommendation == "".join(tokens) == reply + " "
+            
+            # A repeated prompt replays the cached reply as a single token
+            tokens.clear()
+            assert agent(state, config=config)['recommendation'] == recommendation
+            assert tokens == [recommendation] and llm.llm.calls == 1
+            
+            # Without a callback the same answer comes back unstreamed
+            assert agent(state)['recommendation'] == recommendation
+            print(f"   ✅ Streamed {len(recommendation.split())} tokens, replayed from cache")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+def test_pros_cons_agent():
+    """Test concurrent analysis, duplicate collapsing and error mapping"""
+    print("📋 Testing pros/cons agent...")
+    
+    try:
+        llm = StubLLM()
+        agent = ProsConsAgent(llm)
+        candidates = [StubOption("Electric car"), StubOption("broken option"), StubOption("Electric car")]
+        result_state = agent({"candidates": candidates})
+        analyses = result_state['analyses']
+        
+        assert len(analyses) == 3, "expected one analysis per candidate"
+        assert len(llm.prompts) == 2, "duplicate candidates should share one LLM call"
+        assert analyses[0]['analysis'] == analyses[2]['analysis']
+        assert analyses[1]['analysis'].startswith("Error analyzing option:")
+        print(f"   ✅ {len(analyses)} analyses from {len(llm.prompts)} LLM calls")
+        
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
 if __name__ == "__main__":
     print("🧪 Testing System Components")
     print("=" * 30)
     
-    if test_data_processing():
+    if (test_csv_loading() and test_data_processing() and test_vector_store_persistence()
+            and test_index_selection()
+            and test_llm_cache() and test_decision_streaming()
+            and test_pros_cons_agent()):
         print("\n✅ Core components working correctly!")
         print("📝 The vector search and option finding are functional")
         print("🤖 LLM integration may need model name adjustment")
@@ -1,5 +1,6 @@
 import streamlit as st
-import tempfile
+import hashlib
+import io
 import os
 import sys
 
@@ -16,56 +17,71 @@ from workflow.orchestrator import build_workflow
 from llm.gemini_wrapper import GeminiLLMWrapper
 from config import GOOGLE_API_KEY
 
+@st.cache_resource
+def get_llm(api_key):
+    return GeminiLLMWrapper(api_key=api_key)
+
+@st.cache_resource(max_entries=8)
+def get_workflow(upload_digest, _csv_bytes, api_key):
+    # Keyed on the upload's digest (the leading underscore keeps Streamlit from
+    # hashing the raw bytes), so query changes and re-uploads of the same CSV
+    # reuse the vector store, agents and compiled graph
+    docs = load_csv(io.BytesIO(_csv_bytes))
+    vs = VectorStore()
+    vs.add_documents(docs)
+    
+    llm = get_llm(api_key)
+    option_finder = OptionFinderAgent(vs)
+    pros_cons = ProsConsAgent(llm)
+    decision = DecisionAgent(llm)
+    return build_workflow(option_finder, pros_cons, decision)
+
 st.title("Multi-Agent Decision System")
 
 uploaded = st.file_uploader("Upload CSV", type='csv')
 query = st.text_input("Describe your objective/query:")
 
 if uploaded and query:
-    # Save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        tmp_file.write(uploaded.getvalue())
-        tmp_file_path = tmp_file.name
-    
     try:
-        # Process the data
+        # Process the data and set up the agents (cached across reruns)
         with st.spinner("Loading and processing data..."):
-            docs = load_csv(tmp_file_path)
-            vs = VectorStore()
-            vs.add_documents(docs)
-        
-        # Initialize LLM and agents
-        with st.spinner("Initializing AI agents..."):
-            llm = GeminiLLMWrapper(api_key=GOOGLE_API_KEY)
-            option_finder = OptionFinderAgent(vs)
-            pros_cons = ProsConsAgent(llm)
-            decision = DecisionAgent(llm)
+            csv_bytes = uploaded.getvalue()
+            upload_digest = hashlib.blake2b(csv_bytes).hexdigest()
+            workflow = get_workflow(upload_digest, csv_bytes, GOOGLE_API_KEY)
+
+        # Run the workflow, rendering each agent's output as soon as it is ready
+        tokens = []
+        recommendation_box = None
+
+        def on_token(token):
+            tokens.append(token)
+            recommendation_box.markdown("".join(tokens))
 
-        # Build and run workflow
         with st.spinner("Analyzing options and generating recommendation..."):
-            workflow = build_workflow(option_finder, pros_cons, decision)
             state = {"query": query}
-            result = workflow.invoke(state)
-        
-        # Display results
-        st.subheader("Found Options")
-        if 'candidates' in result:
-            for i, candidate in enumerate(result['candidates']):
-                st.write(f"**Option {i+1}:** {candidate.page_content}")
-        
-        st.subheader("Analysis")
-        if 'analyses' in result:
-            for analysis in result['analyses']:
-                with st.expander(f"Analysis for: {analysis['option'][:50]}..."):
-                    st.write(analysis['analysis'])
-        
-        st.subheader("Final Recommendation")
-        st.write(result['recommendation'])
+            config = {"configurable": {"on_token": on_token}}
+            for update in workflow.stream(state, config=config, stream_mode="updates"):
+                if "find_options" in update:
+                    result = update["find_options"]
+                    st.subheader("Found Options")
+                    if 'candidates' in result:
+                        for i, candidate in enumerate(result['candidates']):
+                            st.write(f"**Option {i+1}:** {candidate.page_content}")
+
+                if "pros_cons" in update:
+                    result = update["pros_cons"]
+                    st.subheader("Analysis")
+                    if 'analyses' in result:
+                        for analysis in result['analyses']:
+                            with st.expander(f"Analysis for: {analysis['option'][:50]}..."):
+                                st.write(analysis['analysis'])
+
+                    st.subheader("Final Recommendation")
+                    recommendation_box = st.empty()
+
+                if "decision" in update:
+                    # Replaces the streamed text with the final (or error) message
+                    recommendation_box.markdown(update["decision"]['recommendation'])
         
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
-    
-    finally:
-        # Clean up temporary file
-        if os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
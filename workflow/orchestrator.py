@@ -1,7 +1,11 @@
-from langgraph.graph import StateGraph, END
+from .state import AgentState
 
 def build_workflow(option_finder, pros_cons, decision):
-    wf = StateGraph(dict)
+    # langgraph is imported on first build so that importing this module (for
+    # AgentState or from tooling that never runs the graph) stays cheap
+    from langgraph.graph import StateGraph, END
+
+    wf = StateGraph(AgentState)
     wf.add_node("find_options", option_finder)
     wf.add_node("pros_cons", pros_cons)
     wf.add_node("decision", decision)
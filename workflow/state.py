@@ -0,0 +1,10 @@
+from typing import Any, Dict, List, TypedDict
+
+class AgentState(TypedDict, total=False):
+    # Each key is written by exactly one node: find_options -> candidates,
+    # pros_cons -> analyses, decision -> recommendation. Nodes return only the
+    # keys they produce and LangGraph merges them into the running state.
+    query: str
+    candidates: List[Any]
+    analyses: List[Dict[str, str]]
+    recommendation: str